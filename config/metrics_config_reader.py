@@ -5,10 +5,34 @@ Enhanced version with explicit metrics file loading - no defaults
 
 import os
 import yaml
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pydantic import BaseModel, Field, ConfigDict
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+# Parsed metrics files shared across Config instances, keyed by path -> (mtime, data)
+_METRICS_FILE_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+
+def _load_metrics_yaml(metrics_path: Path) -> Any:
+    """Parse a metrics YAML file, reusing the cached result while its mtime is unchanged"""
+    cache_key = str(metrics_path)
+    mtime = metrics_path.stat().st_mtime
+    cached = _METRICS_FILE_CACHE.get(cache_key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    # Read raw bytes in one call; libyaml detects the encoding itself
+    metrics_data = yaml.load(metrics_path.read_bytes(), Loader=_YamlLoader)
+    
+    _METRICS_FILE_CACHE[cache_key] = (mtime, metrics_data)
+    return metrics_data
+
 
 class PrometheusConfig(BaseModel):
     """Prometheus configuration"""
@@ -117,9 +141,8 @@ class Config(BaseModel):
                     'metrics_loaded': 0
                 }
             
-            # Load YAML
-            with open(metrics_path, 'r') as f:
-                metrics_data = yaml.safe_load(f)
+            # Load YAML (cached per file until it changes on disk)
+            metrics_data = _load_metrics_yaml(metrics_path)
             
             # Handle both formats: {'metrics': [...]} or direct list
             if isinstance(metrics_data, dict) and 'metrics' in metrics_data:
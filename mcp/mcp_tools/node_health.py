@@ -3,122 +3,207 @@ etcd Node Health MCP Tool
 Get node health metrics including PLEG relist latency for master nodes
 """
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Optional
-import pytz
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from fastmcp import Context
+from prometheus_client import Counter, Histogram
 
 from .models import NodeHealthResponse, DurationInput
 
 logger = logging.getLogger(__name__)
 
+# Self-observability for per-group Prometheus collection
+_COLLECT_SECONDS = Histogram(
+    'ocp_node_health_collect_seconds',
+    'Time spent collecting node health metrics for a node group',
+    ['node_group'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+)
+_COLLECT_ERRORS = Counter(
+    'ocp_node_health_errors_total',
+    'Failed node health collections for a node group',
+    ['node_group']
+)
 
-def register_node_health_tool(mcp, get_components_func):
-    """Register the node health tool with the MCP server"""
+
+def _read_max_concurrency(default=8):
+    """Read OCP_PROM_MAX_CONC (at least 1), falling back to the default when unset or not an integer"""
+    value = os.environ.get('OCP_PROM_MAX_CONC')
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Invalid OCP_PROM_MAX_CONC value {value!r}, using {default}")
+        return default
+
+
+# Upper bound on concurrent group collections across all calls, to protect Prometheus
+_PROM_MAX_CONCURRENCY = _read_max_concurrency()
+_prom_semaphore: Optional[asyncio.Semaphore] = None
+
+# Read-only default for missing nested metric sections
+_EMPTY: Dict = {}
+
+# Node groups queried on every call: controlplane (master), infra, workload, worker
+_NODE_GROUPS = ('controlplane', 'infra', 'workload', 'worker')
+
+# Node groups found to have no nodes are skipped until this discovery expires
+_EMPTY_GROUPS_TTL_SECONDS = 300
+_empty_groups_cache: Optional[Tuple[frozenset, float]] = None
+
+# Successful per-group results keyed by (node_group, duration, top_n_nodes, time bucket); after a
+# partial failure (which is not cached as a response) only the failed groups are queried again
+_GROUP_CACHE_TTL_SECONDS = 30
+_group_cache: Dict[Tuple[str, str, Optional[int], int], asyncio.Future] = {}
+
+# Fully successful responses are reused for repeated calls with the same duration inside one time bucket
+_RESPONSE_CACHE_TTL_SECONDS = 30
+_response_cache: Dict[Tuple[str, int], NodeHealthResponse] = {}
+
+# Collections currently running, keyed by duration, shared by concurrent identical calls
+_in_flight_requests: Dict[str, asyncio.Future] = {}
+
+
+# Tool description advertised to MCP clients for get_ocp_node_health
+_NODE_HEALTH_TOOL_DOC = """
+    Get comprehensive node health metrics for all node groups (controlplane, infra, worker, workload).
     
-    @mcp.tool()
-    async def get_ocp_node_health(request: Optional[DurationInput] = None) -> NodeHealthResponse:
-        """
-        Get comprehensive node health metrics for all node groups (controlplane, infra, worker, workload).
-        
-        Monitors critical health indicators at the node level for all node groups:
-        - PLEG (Pod Lifecycle Event Generator) relist P99 latency per node
-        - PLEG performance patterns and health scoring
-        - Node health status based on PLEG metrics
-        - Cross-node PLEG latency comparison
-        
-        PLEG (Pod Lifecycle Event Generator) is a critical kubelet component that:
-        - Monitors pod lifecycle state changes
-        - Detects container state transitions
-        - Reports pod status to the API server
-        - Triggers pod sync operations
-        
-        PLEG relist latency metrics:
-        - P99 latency: 99th percentile relist operation duration
-        - Max latency: Maximum relist latency observed
-        - Min latency: Minimum relist latency observed
-        - Performance thresholds:
-          * Normal: < 100ms (0.1s)
-          * Warning: 100ms - 1000ms (0.1s - 1s)
-          * Critical: > 1000ms (> 1s)
-        
-        High PLEG relist latency indicates:
-        - Kubelet performance degradation
-        - Slow pod lifecycle operations
-        - Delayed pod status updates
-        - Potential node stability issues
-        - Container runtime problems
-        
-        Common causes of high PLEG latency:
-        - High pod density on nodes
-        - Container runtime performance issues
-        - Disk I/O bottlenecks
-        - CPU contention on nodes
-        - Network storage latency
-        - Large number of container state changes
-        
-        The tool queries all node groups (controlplane, infra, workload, worker) and returns
-        results grouped by role. For worker nodes, the top 3 nodes by PLEG latency are returned
-        to focus on nodes with the highest latency. If a specific node group has no nodes 
-        or fails to collect, it will be marked with an error status but other groups will still be returned.
-        
-        Args:
-            request: Optional request object with duration field. Default duration is '1h'.
-                   Examples: '15m', '30m', '1h', '2h', '6h', '12h', '1d'
+    Monitors critical health indicators at the node level for all node groups:
+    - PLEG (Pod Lifecycle Event Generator) relist P99 latency per node
+    - PLEG performance patterns and health scoring
+    - Node health status based on PLEG metrics
+    - Cross-node PLEG latency comparison
+    
+    PLEG (Pod Lifecycle Event Generator) is a critical kubelet component that:
+    - Monitors pod lifecycle state changes
+    - Detects container state transitions
+    - Reports pod status to the API server
+    - Triggers pod sync operations
+    
+    PLEG relist latency metrics:
+    - P99 latency: 99th percentile relist operation duration
+    - Max latency: Maximum relist latency observed
+    - Min latency: Minimum relist latency observed
+    - Performance thresholds:
+      * Normal: < 100ms (0.1s)
+      * Warning: 100ms - 1000ms (0.1s - 1s)
+      * Critical: > 1000ms (> 1s)
+    
+    High PLEG relist latency indicates:
+    - Kubelet performance degradation
+    - Slow pod lifecycle operations
+    - Delayed pod status updates
+    - Potential node stability issues
+    - Container runtime problems
+    
+    Common causes of high PLEG latency:
+    - High pod density on nodes
+    - Container runtime performance issues
+    - Disk I/O bottlenecks
+    - CPU contention on nodes
+    - Network storage latency
+    - Large number of container state changes
+    
+    The tool queries all node groups (controlplane, infra, workload, worker) and returns
+    results grouped by role. For worker nodes, the top 3 nodes by PLEG latency are returned
+    to focus on nodes with the highest latency. If a specific node group has no nodes 
+    or fails to collect, it will be marked with an error status but other groups will still be returned.
+    
+    Args:
+        request: Optional request object with duration field. Default duration is '1h'.
+               Examples: '15m', '30m', '1h', '2h', '6h', '12h', '1d'
+    
+    Returns:
+        ETCDNodeUsageResponse: Node health metrics including PLEG relist P99 latency, 
+                              max/min latency values, and health status for all node groups.
+                              Results are organized in a 'node_groups' dictionary with keys: 
+                              controlplane, infra, workload, worker.
+                              
+    Use Cases:
+        - Monitor kubelet health across all node groups
+        - Identify nodes with degraded PLEG performance
+        - Troubleshoot pod lifecycle operation delays
+        - Detect node stability issues early
+        - Capacity planning based on pod density limits
+        - Performance baseline establishment
+        - Post-upgrade health validation
         
-        Returns:
-            ETCDNodeUsageResponse: Node health metrics including PLEG relist P99 latency, 
-                                  max/min latency values, and health status for all node groups.
-                                  Results are organized in a 'node_groups' dictionary with keys: 
-                                  controlplane, infra, workload, worker.
-                                  
-        Use Cases:
-            - Monitor kubelet health across all node groups
-            - Identify nodes with degraded PLEG performance
-            - Troubleshoot pod lifecycle operation delays
-            - Detect node stability issues early
-            - Capacity planning based on pod density limits
-            - Performance baseline establishment
-            - Post-upgrade health validation
-            
-        Example Response Structure:
-            {
-                "status": "success",
-                "node_groups": {
-                    "controlplane": {
-                        "status": "success",
-                        "total_nodes": 3,
-                        "nodes": [
-                            {"name": "master-0.example.com", "role": "controlplane"}
-                        ],
-                        "metrics": {
-                            "p99_kubelet_pleg_relist_duration": {
-                                "nodes": {
-                                    "master-0.example.com": {
-                                        "p99": 0.0125,
-                                        "max": 0.0150,
-                                        "min": 0.0100,
-                                        "unit": "second"
-                                    }
+    Example Response Structure:
+        {
+            "status": "success",
+            "node_groups": {
+                "controlplane": {
+                    "status": "success",
+                    "total_nodes": 3,
+                    "nodes": [
+                        {"name": "master-0.example.com", "role": "controlplane"}
+                    ],
+                    "metrics": {
+                        "p99_kubelet_pleg_relist_duration": {
+                            "nodes": {
+                                "master-0.example.com": {
+                                    "p99": 0.0125,
+                                    "max": 0.0150,
+                                    "min": 0.0100,
+                                    "unit": "second"
                                 }
                             }
-                        },
-                        "top_nodes_by_pleg_latency": [
-                            {
-                                "rank": 1,
-                                "node": "master-0.example.com",
-                                "role": "controlplane",
-                                "p99_latency": 0.0125,
-                                "unit": "second"
-                            }
-                        ]
-                    }
+                        }
+                    },
+                    "top_nodes_by_pleg_latency": [
+                        {
+                            "rank": 1,
+                            "node": "master-0.example.com",
+                            "role": "controlplane",
+                            "p99_latency": 0.0125,
+                            "unit": "second"
+                        }
+                    ]
                 }
             }
-        """
-        # Extract duration from request, default to "1h" if not provided
-        duration = request.duration if request and request.duration else "1h"
+        }
+    """
+
+
+def register_node_health_tool(mcp, get_components_func):
+    """Register the node health tool with the MCP server"""
+    
+    # Collector built on first use when the server did not provide one, shared by later calls
+    collector_init_task = None
+    
+    async def _init_node_health_collector(auth_manager, config):
+        """Initialize auth (if needed) and nodeHealthCollector, returning (collector, error)"""
+        if auth_manager is None:
+            # Any failure here is returned, not raised, so the shared init task can be retried
+            try:
+                from ocauth.openshift_auth import OpenShiftAuth
+                auth_manager = OpenShiftAuth(config.kubeconfig_path if config else None)
+                await auth_manager.initialize()
+            except Exception as e:
+                logger.error(f"Failed to initialize OpenShift auth for node health: {e}")
+                return None, "Failed to initialize OpenShift auth for node health"
         
+        try:
+            from tools.node.node_health import nodeHealthCollector
+            prometheus_config = {
+                'url': auth_manager.prometheus_url,
+                'token': getattr(auth_manager, 'prometheus_token', None),
+                'verify_ssl': False
+            }
+            return nodeHealthCollector(auth_manager, prometheus_config), None
+        except Exception as e:
+            return None, f"Failed to initialize nodeHealthCollector: {e}"
+    
+    async def _collect_node_health(duration, ctx):
+        """Collect node health for all node groups and build the tool response"""
+        nonlocal collector_init_task
         components = get_components_func()
         auth_manager = components.get('auth_manager')
         node_health_collector = components.get('node_health_collector')
@@ -126,78 +211,67 @@ def register_node_health_tool(mcp, get_components_func):
         
         try:
             if not node_health_collector:
-                # Lazy initialize
-                if auth_manager is None:
-                    from ocauth.openshift_auth import OpenShiftAuth
-                    auth_manager = OpenShiftAuth(config.kubeconfig_path if config else None)
-                    try:
-                        await auth_manager.initialize()
-                    except Exception:
-                        return NodeHealthResponse(
-                            status="error",
-                            error="Failed to initialize OpenShift auth for node health",
-                            timestamp=datetime.now(pytz.UTC).isoformat(),
-                            duration=duration
-                        )
-                
-                try:
-                    from tools.node.node_health import nodeHealthCollector
-                    prometheus_config = {
-                        'url': auth_manager.prometheus_url,
-                        'token': getattr(auth_manager, 'prometheus_token', None),
-                        'verify_ssl': False
-                    }
-                    node_health_collector = nodeHealthCollector(auth_manager, prometheus_config)
-                    components['node_health_collector'] = node_health_collector
-                except Exception as e:
+                # Lazy initialize once; concurrent first callers await the same task
+                init_task = collector_init_task
+                if init_task is None:
+                    init_task = asyncio.ensure_future(_init_node_health_collector(auth_manager, config))
+                    collector_init_task = init_task
+                node_health_collector, init_error = await init_task
+                if init_error:
+                    # Allow the next call to retry initialization
+                    if collector_init_task is init_task:
+                        collector_init_task = None
                     return NodeHealthResponse(
                         status="error",
-                        error=f"Failed to initialize nodeHealthCollector: {e}",
-                        timestamp=datetime.now(pytz.UTC).isoformat(),
+                        error=init_error,
+                        timestamp=datetime.now(timezone.utc).isoformat(),
                         duration=duration
                     )
             
+            # Without a Prometheus URL every group would fail after its node lookup; fail once up front
+            if not _has_prometheus_url(node_health_collector):
+                logger.error("Prometheus URL unavailable, skipping node health collection")
+                return NodeHealthResponse(
+                    status="error",
+                    error="Prometheus URL unavailable",
+                    timestamp=datetime.now(timezone.utc).isoformat(),
+                    duration=duration
+                )
+            
             # Collect metrics for all node groups
             node_groups = {}
             overall_status = 'success'
             errors = []
             
-            # Query each node group: controlplane (master), infra, workload, worker
-            for node_group in ['controlplane', 'infra', 'workload', 'worker']:
-                try:
-                    # For worker nodes, return top 3 by PLEG latency
-                    if node_group == 'worker':
-                        group_result = await node_health_collector.collect_all_metrics(
-                            node_group=node_group, 
-                            duration=duration,
-                            top_n_nodes=3
-                        )
-                    else:
-                        group_result = await node_health_collector.collect_all_metrics(
-                            node_group=node_group, 
-                            duration=duration
-                        )
-                    
-                    if group_result.get('status') == 'success':
-                        node_groups[node_group] = group_result
-                    else:
-                        # Store error but don't fail the entire request
-                        error_msg = group_result.get('error', 'Unknown error')
-                        node_groups[node_group] = {
-                            'status': 'error',
-                            'error': error_msg
-                        }
-                        errors.append(f"{node_group}: {error_msg}")
-                        logger.warning(f"Error collecting {node_group} node health: {error_msg}")
-                except Exception as e:
+            # Skip groups recently found to have no nodes, reporting them as skipped
+            empty_groups = _get_empty_groups()
+            results = {
+                node_group: {'status': 'error', 'error': _skipped_empty_error(node_group), 'total_nodes': 0}
+                for node_group in empty_groups
+            }
+            groups_to_collect = [g for g in _NODE_GROUPS if g not in empty_groups]
+            
+            # Query remaining node groups concurrently, reporting progress as each group completes
+            for completed in asyncio.as_completed(
+                [_collect_group(node_health_collector, node_group, duration) for node_group in groups_to_collect]
+            ):
+                node_group, group_result = await completed
+                results[node_group] = group_result
+                await _report_progress(ctx, len(results) - len(empty_groups), len(groups_to_collect))
+            
+            if not empty_groups:
+                _store_empty_groups(results)
+            
+            for node_group in _NODE_GROUPS:
+                group_result = results[node_group]
+                if isinstance(group_result, Exception):
                     # Store error but continue with other groups
-                    error_msg = str(e)
-                    node_groups[node_group] = {
-                        'status': 'error',
-                        'error': error_msg
-                    }
-                    errors.append(f"{node_group}: {error_msg}")
-                    logger.error(f"Error collecting {node_group} node health: {e}")
+                    _record_group_error(node_groups, errors, node_group, str(group_result), exc=True)
+                elif group_result.get('status') == 'success':
+                    node_groups[node_group] = group_result
+                else:
+                    # Store error but don't fail the entire request
+                    _record_group_error(node_groups, errors, node_group, group_result.get('error', 'Unknown error'))
             
             # Determine overall status
             successful_groups = [g for g, data in node_groups.items() if data.get('status') == 'success']
@@ -206,10 +280,15 @@ def register_node_health_tool(mcp, get_components_func):
             elif errors:
                 overall_status = 'partial_success'
             
+            if successful_groups:
+                critical_nodes, warning_nodes, healthy_nodes = _summarize_pleg(node_groups)
+            else:
+                critical_nodes = warning_nodes = healthy_nodes = 0
+            
             # Build combined result
             combined_result = {
                 'status': overall_status,
-                'timestamp': datetime.now(pytz.UTC).isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
                 'duration': duration,
                 'category': 'node_health',
                 'node_groups': node_groups,
@@ -217,9 +296,9 @@ def register_node_health_tool(mcp, get_components_func):
                     'total_node_groups': len(node_groups),
                     'successful_groups': len(successful_groups),
                     'failed_groups': len(errors),
-                    'critical_nodes': _count_critical_nodes(node_groups),
-                    'warning_nodes': _count_warning_nodes(node_groups),
-                    'healthy_nodes': _count_healthy_nodes(node_groups)
+                    'critical_nodes': critical_nodes,
+                    'warning_nodes': warning_nodes,
+                    'healthy_nodes': healthy_nodes
                 }
             }
             
@@ -228,67 +307,223 @@ def register_node_health_tool(mcp, get_components_func):
             if overall_status == 'error':
                 combined_result['error'] = 'Failed to collect health metrics for any node group'
             
-            return NodeHealthResponse(
+            # combined_result is built internally, so skip re-validating the nested payload
+            response = NodeHealthResponse.model_construct(
                 status=overall_status,
                 data=combined_result,
                 error=combined_result.get('error'),
                 timestamp=combined_result['timestamp'],
                 duration=duration
             )
+            # Responses with failed groups are not reused so those groups are retried on the next call;
+            # groups confirmed to have no nodes (total_nodes == 0) are not failures worth retrying
+            if overall_status != 'error' and not any(_is_retryable(results[g]) for g in _NODE_GROUPS):
+                _store_cached_response(_response_cache_key(duration), response)
+            return response
             
         except Exception as e:
             logger.error(f"Error collecting node health metrics: {e}")
             return NodeHealthResponse(
                 status="error",
                 error=str(e),
-                timestamp=datetime.now(pytz.UTC).isoformat(),
+                timestamp=datetime.now(timezone.utc).isoformat(),
                 duration=duration
             )
+    
+    async def get_ocp_node_health(request: Optional[DurationInput] = None, ctx: Context = None) -> NodeHealthResponse:
+        # Extract duration from request, default to "1h" if not provided
+        duration = request.duration if request and request.duration else "1h"
+        
+        cached_response = _response_cache.get(_response_cache_key(duration))
+        if cached_response is not None:
+            return cached_response
+        
+        # Coalesce concurrent calls for the same duration onto one collection
+        in_flight = _in_flight_requests.get(duration)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(_collect_node_health(duration, ctx))
+            _in_flight_requests[duration] = in_flight
+            in_flight.add_done_callback(lambda _: _in_flight_requests.pop(duration, None))
+        
+        # Shield so a cancelled caller does not cancel a collection other callers share
+        return await asyncio.shield(in_flight)
+    
+    # The long description lives in a module constant; FastMCP reads it from __doc__
+    get_ocp_node_health.__doc__ = _NODE_HEALTH_TOOL_DOC
+    mcp.tool()(get_ocp_node_health)
 
 
-def _count_critical_nodes(node_groups):
-    """Count nodes with critical PLEG latency (>1s)"""
-    count = 0
-    for group_data in node_groups.values():
-        if group_data.get('status') != 'success':
-            continue
-        metrics = group_data.get('metrics', {})
-        pleg_metrics = metrics.get('p99_kubelet_pleg_relist_duration', {})
-        nodes = pleg_metrics.get('nodes', {})
-        for node_data in nodes.values():
-            p99 = node_data.get('p99', 0)
-            if p99 > 1.0:  # Critical: > 1 second
-                count += 1
-    return count
+def _has_prometheus_url(node_health_collector):
+    """Check whether the collector can resolve a Prometheus URL (config or PROMETHEUS_URL env)"""
+    from tools.utils.promql_utility import mcpToolsUtility
+    prometheus_config = getattr(node_health_collector, 'prometheus_config', None)
+    return bool(mcpToolsUtility.build_prometheus_config(prometheus_config).get('url'))
 
 
-def _count_warning_nodes(node_groups):
-    """Count nodes with warning PLEG latency (0.1s - 1s)"""
-    count = 0
-    for group_data in node_groups.values():
-        if group_data.get('status') != 'success':
-            continue
-        metrics = group_data.get('metrics', {})
-        pleg_metrics = metrics.get('p99_kubelet_pleg_relist_duration', {})
-        nodes = pleg_metrics.get('nodes', {})
-        for node_data in nodes.values():
-            p99 = node_data.get('p99', 0)
-            if 0.1 < p99 <= 1.0:  # Warning: 0.1s - 1s
-                count += 1
-    return count
+async def _collect_group(node_health_collector, node_group, duration):
+    """Collect one node group, returning (node_group, result or raised exception)
+    
+    Successful results are reused within a time bucket, and concurrent misses for the
+    same key share a single in-flight collection.
+    """
+    # For worker nodes, return top 3 by PLEG latency
+    top_n_nodes = 3 if node_group == 'worker' else None
+    bucket = int(time.monotonic() // _GROUP_CACHE_TTL_SECONDS)
+    cache_key = (node_group, duration, top_n_nodes, bucket)
+    
+    future = _group_cache.get(cache_key)
+    if future is None:
+        for key in [k for k in _group_cache if k[3] != bucket]:
+            del _group_cache[key]
+        future = asyncio.ensure_future(
+            _fetch_group(node_health_collector, node_group, duration, top_n_nodes)
+        )
+        _group_cache[cache_key] = future
+    
+    # Shield so a cancelled caller does not cancel a collection other callers share
+    group_result = await asyncio.shield(future)
+    if not isinstance(group_result, dict) or group_result.get('status') != 'success':
+        # Only successful results are cached; failures are retried on the next call
+        if _group_cache.get(cache_key) is future:
+            del _group_cache[cache_key]
+    return node_group, group_result
 
 
-def _count_healthy_nodes(node_groups):
-    """Count nodes with healthy PLEG latency (<0.1s)"""
-    count = 0
+async def _fetch_group(node_health_collector, node_group, duration, top_n_nodes):
+    """Query one node group from Prometheus, returning the result or the raised exception"""
+    try:
+        async with _get_prom_semaphore(), _timed_collection(node_group):
+            if top_n_nodes is not None:
+                group_result = await node_health_collector.collect_all_metrics(
+                    node_group=node_group,
+                    duration=duration,
+                    top_n_nodes=top_n_nodes
+                )
+            else:
+                group_result = await node_health_collector.collect_all_metrics(
+                    node_group=node_group,
+                    duration=duration
+                )
+            if not isinstance(group_result, dict):
+                raise TypeError(f"Unexpected {node_group} node health result: {type(group_result).__name__}")
+    except Exception as e:
+        return e
+    
+    if group_result.get('status') != 'success':
+        _COLLECT_ERRORS.labels(node_group=node_group).inc()
+    return group_result
+
+
+async def _report_progress(ctx, progress, total):
+    """Report progress to the calling client; best effort, since the collection may be shared"""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(progress, total)
+    except Exception as e:
+        logger.debug(f"Failed to report node health progress: {e}")
+
+
+def _get_prom_semaphore():
+    """Return the semaphore bounding concurrent Prometheus collections, created on first use"""
+    global _prom_semaphore
+    if _prom_semaphore is None:
+        # Created lazily so it binds to the running event loop
+        _prom_semaphore = asyncio.Semaphore(_PROM_MAX_CONCURRENCY)
+    return _prom_semaphore
+
+
+@asynccontextmanager
+async def _timed_collection(node_group):
+    """Record collection latency for a node group, counting raised exceptions as errors"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _COLLECT_ERRORS.labels(node_group=node_group).inc()
+        raise
+    finally:
+        _COLLECT_SECONDS.labels(node_group=node_group).observe(time.perf_counter() - start)
+
+
+def _skipped_empty_error(node_group):
+    """Error reported for a node group skipped because a recent lookup found no nodes"""
+    return f'Skipped: no {node_group} nodes found in the last {_EMPTY_GROUPS_TTL_SECONDS}s'
+
+
+def _get_empty_groups():
+    """Return node groups known to have no nodes, or an empty set once the discovery expired"""
+    if _empty_groups_cache is None or time.monotonic() - _empty_groups_cache[1] > _EMPTY_GROUPS_TTL_SECONDS:
+        return frozenset()
+    return _empty_groups_cache[0]
+
+
+def _store_empty_groups(results):
+    """Remember which node groups came back with no nodes
+    
+    A group counts as empty only when its node lookup succeeded and found zero nodes
+    (total_nodes == 0). Nothing is stored unless another group succeeded in the same call,
+    so a cluster-wide outage is never mistaken for empty groups.
+    """
+    global _empty_groups_cache
+    group_results = [r for r in results.values() if isinstance(r, dict)]
+    if not any(r.get('status') == 'success' for r in group_results):
+        return
+    empty_groups = frozenset(
+        node_group for node_group, group_result in results.items()
+        if isinstance(group_result, dict)
+        and group_result.get('status') != 'success'
+        and group_result.get('total_nodes') == 0
+    )
+    _empty_groups_cache = (empty_groups, time.monotonic())
+
+
+def _is_retryable(group_result):
+    """Whether a group result is a failure worth retrying, i.e. neither success nor a confirmed-empty group"""
+    if not isinstance(group_result, dict):
+        return True
+    return group_result.get('status') != 'success' and group_result.get('total_nodes') != 0
+
+
+def _record_group_error(node_groups, errors, node_group, error_msg, exc=False):
+    """Mark a node group as failed and log it; exceptions log at error level, failed results at warning"""
+    node_groups[node_group] = {
+        'status': 'error',
+        'error': error_msg
+    }
+    errors.append(f"{node_group}: {error_msg}")
+    log = logger.error if exc else logger.warning
+    log(f"Error collecting {node_group} node health: {error_msg}")
+
+
+def _response_cache_key(duration):
+    """Build the response cache key from duration and the current time bucket"""
+    return (duration, int(time.monotonic() // _RESPONSE_CACHE_TTL_SECONDS))
+
+
+def _store_cached_response(cache_key, response):
+    """Cache a response and drop entries from earlier time buckets"""
+    current_bucket = cache_key[1]
+    for key in [k for k in _response_cache if k[1] != current_bucket]:
+        del _response_cache[key]
+    _response_cache[cache_key] = response
+
+
+def _summarize_pleg(node_groups):
+    """Count critical (>1s), warning (0.1s - 1s) and healthy (<=0.1s) nodes by PLEG p99 latency in one pass"""
+    critical = warning = healthy = 0
     for group_data in node_groups.values():
         if group_data.get('status') != 'success':
             continue
-        metrics = group_data.get('metrics', {})
-        pleg_metrics = metrics.get('p99_kubelet_pleg_relist_duration', {})
-        nodes = pleg_metrics.get('nodes', {})
+        metrics = group_data.get('metrics') or _EMPTY
+        pleg_metrics = metrics.get('p99_kubelet_pleg_relist_duration') or _EMPTY
+        nodes = pleg_metrics.get('nodes') or _EMPTY
         for node_data in nodes.values():
             p99 = node_data.get('p99', 0)
-            if p99 <= 0.1:  # Healthy: <= 0.1 second
-                count += 1
-    return count
\ No newline at end of file
+            if p99 > 1.0:  # Critical: > 1 second
+                critical += 1
+            elif p99 > 0.1:  # Warning: 0.1s - 1s
+                warning += 1
+            else:  # Healthy: <= 0.1 second
+                healthy += 1
+    return critical, warning, healthy
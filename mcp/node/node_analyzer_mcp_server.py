@@ -59,9 +59,12 @@ except Exception:
 try:
     from fastmcp import FastMCP
     import uvicorn
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    from starlette.requests import Request
+    from starlette.responses import Response
 except ImportError as e:
     logger.error(f"Required dependencies not installed: {e}")
-    logger.error("Please install: pip install fastmcp>=1.12.4 uvicorn")
+    logger.error("Please install: pip install fastmcp>=1.12.4 uvicorn prometheus-client")
     sys.exit(1)
 
 # Import our modules
@@ -175,6 +178,13 @@ register_node_usage_tool(mcp, get_global_components)
 register_node_health_tool(mcp, get_global_components)
 logger.info("✅ All MCP tools registered")
 
+# ==================== Metrics Endpoint ====================
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> Response:
+    """Expose the server's own Prometheus metrics (e.g. node health collection latency and errors)"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # ==================== Startup and Main ====================
 
 async def startup_event():
@@ -0,0 +1,10 @@
+"""Shared pytest configuration: make the repo root and mcp/ importable"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+for path in (ROOT, ROOT / 'mcp'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
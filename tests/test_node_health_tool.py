@@ -0,0 +1,364 @@
+"""Tests for the get_ocp_node_health MCP tool: response and per-group caching, lazy collector init,
+progress reporting, empty node groups, call coalescing and concurrency settings
+"""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_tools import node_health
+from mcp_tools.models import DurationInput
+
+
+class FakeMCP:
+    """Captures functions registered with mcp.tool()"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self):
+        def decorator(func):
+            self.tools[func.__name__] = func
+            return func
+        return decorator
+
+
+class FakeCollector:
+    """Stand-in for nodeHealthCollector returning canned per-group results"""
+
+    def __init__(self, results=None):
+        self.prometheus_config = {'url': 'https://prometheus.example.com'}
+        self.results = results or {}
+        self.calls = []
+
+    async def collect_all_metrics(self, node_group, duration=None, top_n_nodes=3):
+        self.calls.append(node_group)
+        result = self.results.get(node_group) or _group_success(node_group)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeClock:
+    """Replaces the time module in node_health so cache buckets can be advanced"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+
+def _group_success(node_group, p99=0.05):
+    return {
+        'status': 'success',
+        'node_group': node_group,
+        'total_nodes': 1,
+        'metrics': {
+            'p99_kubelet_pleg_relist_duration': {
+                'nodes': {f'{node_group}-0.example.com': {'p99': p99}}
+            }
+        }
+    }
+
+
+def _group_error(message='Prometheus query failed'):
+    return {'status': 'error', 'error': message}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(node_health, 'time', fake_clock)
+    return fake_clock
+
+
+@pytest.fixture(autouse=True)
+def reset_module_state(monkeypatch):
+    """Give every test empty module-level caches"""
+    monkeypatch.setattr(node_health, '_response_cache', {})
+    monkeypatch.setattr(node_health, '_group_cache', {})
+    monkeypatch.setattr(node_health, '_in_flight_requests', {})
+    monkeypatch.setattr(node_health, '_empty_groups_cache', None)
+    monkeypatch.setattr(node_health, '_prom_semaphore', None)
+
+
+def _register(components):
+    mcp = FakeMCP()
+    node_health.register_node_health_tool(mcp, lambda: dict(components))
+    return mcp.tools['get_ocp_node_health']
+
+
+async def test_success_response_is_cached_within_ttl(clock):
+    collector = FakeCollector()
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    first = await get_ocp_node_health(DurationInput(duration='1h'))
+    second = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert first.status == 'success'
+    assert second is first
+    assert len(collector.calls) == len(node_health._NODE_GROUPS)
+
+
+async def test_cached_response_expires_after_ttl(clock):
+    collector = FakeCollector()
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    first = await get_ocp_node_health(DurationInput(duration='1h'))
+    clock.now += node_health._RESPONSE_CACHE_TTL_SECONDS
+    second = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert second is not first
+    assert len(collector.calls) == 2 * len(node_health._NODE_GROUPS)
+
+
+async def test_partial_success_is_not_cached(clock):
+    collector = FakeCollector({'infra': _group_error()})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    first = await get_ocp_node_health(DurationInput(duration='1h'))
+    assert first.status == 'partial_success'
+
+    collector.results = {}
+    second = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert second.status == 'success'
+    assert second.data['health_summary']['successful_groups'] == len(node_health._NODE_GROUPS)
+
+
+async def test_lazy_init_is_retried_after_failure(clock, monkeypatch):
+    attempts = []
+
+    class FlakyOpenShiftAuth:
+        prometheus_url = 'https://prometheus.example.com'
+
+        def __init__(self, kubeconfig_path=None):
+            attempts.append(kubeconfig_path)
+            if len(attempts) == 1:
+                raise RuntimeError('kubeconfig not readable')
+
+        async def initialize(self):
+            return True
+
+    collector = FakeCollector()
+    monkeypatch.setitem(sys.modules, 'ocauth.openshift_auth',
+                        SimpleNamespace(OpenShiftAuth=FlakyOpenShiftAuth))
+    monkeypatch.setitem(sys.modules, 'tools.node.node_health',
+                        SimpleNamespace(nodeHealthCollector=lambda auth, config: collector))
+    get_ocp_node_health = _register({'config': SimpleNamespace(kubeconfig_path=None)})
+
+    first = await get_ocp_node_health(DurationInput(duration='1h'))
+    second = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert first.status == 'error'
+    assert 'Failed to initialize OpenShift auth' in first.error
+    assert second.status == 'success'
+    assert len(attempts) == 2
+
+
+async def test_progress_report_failure_does_not_fail_collection(clock):
+    class DisconnectedContext:
+        async def report_progress(self, progress, total):
+            raise RuntimeError('client went away')
+
+    get_ocp_node_health = _register({'node_health_collector': FakeCollector()})
+
+    response = await get_ocp_node_health(DurationInput(duration='1h'), DisconnectedContext())
+
+    assert response.status == 'success'
+
+
+def _no_nodes(node_group):
+    return {'status': 'error', 'error': f'No {node_group} nodes found', 'total_nodes': 0}
+
+
+async def test_empty_groups_are_skipped_until_ttl_expires(clock):
+    collector = FakeCollector({'infra': _no_nodes('infra'), 'workload': _no_nodes('workload')})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    await get_ocp_node_health(DurationInput(duration='1h'))
+    collector.calls.clear()
+    clock.now += node_health._RESPONSE_CACHE_TTL_SECONDS
+    skipped = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert sorted(collector.calls) == ['controlplane', 'worker']
+    assert skipped.data['node_groups']['infra']['error'] == node_health._skipped_empty_error('infra')
+
+    collector.calls.clear()
+    clock.now += node_health._EMPTY_GROUPS_TTL_SECONDS
+    await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert sorted(collector.calls) == sorted(node_health._NODE_GROUPS)
+
+
+async def test_empty_groups_not_remembered_when_no_group_succeeds(clock):
+    collector = FakeCollector({g: _no_nodes(g) for g in node_health._NODE_GROUPS})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    first = await get_ocp_node_health(DurationInput(duration='1h'))
+    collector.results = {}
+    second = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert first.status == 'error'
+    assert second.status == 'success'
+
+
+async def test_failed_node_lookup_is_not_remembered_as_empty(clock):
+    collector = FakeCollector({'infra': _group_error('No infra nodes found')})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    await get_ocp_node_health(DurationInput(duration='1h'))
+    collector.calls.clear()
+    collector.results = {}
+    await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert 'infra' in collector.calls
+
+
+async def test_partial_failure_retry_only_queries_failed_groups(clock):
+    collector = FakeCollector({'infra': _group_error()})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    await get_ocp_node_health(DurationInput(duration='1h'))
+    collector.calls.clear()
+    collector.results = {}
+    retried = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert collector.calls == ['infra']
+    assert retried.status == 'success'
+
+
+async def test_group_results_expire_with_their_time_bucket(clock):
+    collector = FakeCollector({'infra': _group_error()})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    await get_ocp_node_health(DurationInput(duration='1h'))
+    collector.calls.clear()
+    clock.now += node_health._GROUP_CACHE_TTL_SECONDS
+    await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert sorted(collector.calls) == sorted(node_health._NODE_GROUPS)
+    assert all(key[3] == int(clock.now // node_health._GROUP_CACHE_TTL_SECONDS)
+               for key in node_health._group_cache)
+
+
+async def test_concurrent_calls_share_one_collection(clock):
+    release = asyncio.Event()
+
+    class SlowCollector(FakeCollector):
+        async def collect_all_metrics(self, node_group, duration=None, top_n_nodes=3):
+            await release.wait()
+            return await super().collect_all_metrics(node_group, duration, top_n_nodes)
+
+    collector = SlowCollector()
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    calls = [asyncio.ensure_future(get_ocp_node_health(DurationInput(duration='1h'))) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    responses = await asyncio.gather(*calls)
+
+    assert all(response is responses[0] for response in responses)
+    assert len(collector.calls) == len(node_health._NODE_GROUPS)
+    assert not node_health._in_flight_requests
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, 8),
+    ('', 8),
+    ('4', 4),
+    ('0', 1),
+    ('not-a-number', 8),
+])
+def test_read_max_concurrency(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv('OCP_PROM_MAX_CONC', raising=False)
+    else:
+        monkeypatch.setenv('OCP_PROM_MAX_CONC', value)
+
+    assert node_health._read_max_concurrency() == expected
+
+
+async def test_response_with_only_empty_groups_failing_is_cached(clock):
+    collector = FakeCollector({'infra': _no_nodes('infra'), 'workload': _no_nodes('workload')})
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    first = await get_ocp_node_health(DurationInput(duration='1h'))
+    second = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert first.status == 'partial_success'
+    assert second is first
+    assert len(collector.calls) == len(node_health._NODE_GROUPS)
+
+
+def test_summarize_pleg_counts_by_threshold():
+    node_groups = {
+        'controlplane': {
+            'status': 'success',
+            'metrics': {'p99_kubelet_pleg_relist_duration': {'nodes': {
+                'a': {'p99': 0.05},
+                'b': {'p99': 0.1},
+                'c': {'p99': 0.5},
+                'd': {'p99': 1.0},
+                'e': {'p99': 2.0},
+                'f': {},
+            }}}
+        },
+        'infra': {
+            'status': 'error',
+            'metrics': {'p99_kubelet_pleg_relist_duration': {'nodes': {'g': {'p99': 5.0}}}}
+        },
+        'worker': {'status': 'success'},
+    }
+
+    # 0.1 and 1.0 sit on the boundaries and count as healthy and warning; a missing p99 is healthy
+    assert node_health._summarize_pleg(node_groups) == (1, 2, 3)
+
+
+async def test_malformed_group_result_only_fails_that_group(clock):
+    class MalformedInfraCollector(FakeCollector):
+        async def collect_all_metrics(self, node_group, duration=None, top_n_nodes=3):
+            if node_group == 'infra':
+                return None
+            return await super().collect_all_metrics(node_group, duration, top_n_nodes)
+
+    get_ocp_node_health = _register({'node_health_collector': MalformedInfraCollector()})
+
+    response = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert response.status == 'partial_success'
+    assert response.data['node_groups']['infra']['status'] == 'error'
+    assert response.data['node_groups']['controlplane']['status'] == 'success'
+    assert response.data['node_groups']['worker']['status'] == 'success'
+
+
+async def test_missing_prometheus_url_fails_before_collection(clock, monkeypatch):
+    monkeypatch.delenv('PROMETHEUS_URL', raising=False)
+    collector = FakeCollector()
+    collector.prometheus_config = {}
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    response = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert response.status == 'error'
+    assert response.error == 'Prometheus URL unavailable'
+    assert collector.calls == []
+
+
+async def test_prometheus_url_from_environment_passes_check(clock, monkeypatch):
+    monkeypatch.setenv('PROMETHEUS_URL', 'https://prometheus.example.com')
+    collector = FakeCollector()
+    collector.prometheus_config = {}
+    get_ocp_node_health = _register({'node_health_collector': collector})
+
+    response = await get_ocp_node_health(DurationInput(duration='1h'))
+
+    assert response.status == 'success'
+    assert len(collector.calls) == len(node_health._NODE_GROUPS)
@@ -161,6 +161,9 @@ class nodeHealthCollector:
             
         Returns:
             Tuple of (full_node_names, short_to_full_map, node_to_role_map)
+            
+        Raises:
+            Exception: If the node group lookup fails
         """
         try:
             groups = await self.utility.get_node_groups()
@@ -209,8 +212,9 @@ class nodeHealthCollector:
             return full_names, short_to_full, node_to_role
             
         except Exception as e:
-            self.logger.error(f"Error getting {node_group} nodes: {e}", exc_info=True)
-            return [], {}, {}
+            # Raise rather than return no nodes, so a failed lookup is not reported as an empty group
+            self.logger.error(f"Error getting {node_group} nodes: {e}")
+            raise
     
     def _get_top_n_nodes_by_metric(self, nodes_data: Dict[str, Any], metric_key: str = 'p99', 
                                     n: int = 3) -> List[Dict[str, Any]]:
@@ -269,6 +273,7 @@ class nodeHealthCollector:
                 return {
                     'status': 'error',
                     'error': f'No {node_group} nodes found',
+                    'total_nodes': 0,
                     'timestamp': datetime.now(timezone.utc).isoformat()
                 }
             